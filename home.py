@@ -8,14 +8,18 @@ st.set_page_config(page_title="MarketDashboard by TTZ/Pod - Home", layout="wide"
 # Inject custom font (Roboto or whatever you're using)
 inject_custom_font()
 
+
+@st.cache_resource
+def _logo():
+    # Decode the PNG once per process instead of on every rerun
+    return Image.open("static/dash_logo.png")
+
+
 # --- Add Logo at Top ---
-logo = Image.open("static/dash_logo.png")
-st.image(logo, width=250)  # You can tweak the width
+st.image(_logo(), width=250)  # You can tweak the width
 
 # --- Title & Intro ---
-st.title("📊 Welcome to MarketDashboard by TTZ/Pod")
-
-st.markdown("""
+INTRO_MD = """
 This app gives you a powerful lens into market structure and ETF dynamics, including:
 
 ### 🚀 ETF Performance
@@ -41,4 +45,7 @@ Enter any ticker to find:
 ---
 
 Use the sidebar to navigate. Built for insights, speed, and sharing alpha with your crew.
-""")
+"""
+
+st.title("📊 Welcome to MarketDashboard by TTZ/Pod")
+st.markdown(INTRO_MD)
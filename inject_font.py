@@ -3,17 +3,39 @@
 import streamlit as st
 from PIL import Image
 
+# Built once at import; identical markup on every call keeps Streamlit's
+# element diffing trivial.
+# Roboto is self-hosted from static/fonts (served by Streamlit's static file
+# handler, see .streamlit/config.toml) so first paint no longer blocks on the
+# Google Fonts CSS round-trip. font-display: swap paints immediately with the
+# fallback face while the woff2 streams in.
+_FONT_CSS = """
+    <style>
+    @font-face {
+        font-family: 'Roboto';
+        font-style: normal;
+        font-weight: 400;
+        font-display: swap;
+        src: url('app/static/fonts/Roboto-Regular.woff2') format('woff2');
+    }
+    @font-face {
+        font-family: 'Roboto';
+        font-style: normal;
+        font-weight: 700;
+        font-display: swap;
+        src: url('app/static/fonts/Roboto-Bold.woff2') format('woff2');
+    }
+
+    html, body, [class*="css"]  {
+        font-family: 'Roboto', sans-serif;
+    }
+    </style>
+"""
+
+
 def inject_custom_font():
     # Roboto or your custom font
-    st.markdown("""
-        <style>
-        @import url('https://fonts.googleapis.com/css2?family=Roboto&display=swap');
-
-        html, body, [class*="css"]  {
-            font-family: 'Roboto', sans-serif;
-        }
-        </style>
-    """, unsafe_allow_html=True)
+    st.markdown(_FONT_CSS, unsafe_allow_html=True)
 
 def inject_sidebar_logo():
     with st.sidebar:
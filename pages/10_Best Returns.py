@@ -1,6 +1,7 @@
 import streamlit as st
-import yfinance as yf
 import pandas as pd
+import numpy as np
+from utils.prices import get_prices
 from inject_font import inject_custom_font, inject_sidebar_logo
 
 st.set_page_config(layout="wide")
@@ -25,62 +26,76 @@ with col2:
 with col3:
     end_date = st.date_input("End Date", value=pd.to_datetime("today"), help="The final date for historical data (defaults to today)")
 
-@st.cache_data
-def load_nasdaq_data(start, end):
-    data = yf.download(ticker, start=start, end=end, auto_adjust=False)
-    return data
+# ticker is an explicit argument so it participates in the cache key
+# (a closure over the widget value would be missed by Streamlit's hasher).
+@st.cache_data(ttl=3600, persist="disk", show_spinner=False)
+def load_nasdaq_data(ticker, start, end):
+    # Served from the local parquet store; only the gap since the last
+    # stored session hits Yahoo.
+    return get_prices(ticker, start, end, auto_adjust=False)
 
-data = load_nasdaq_data(start_date, end_date)
+data = load_nasdaq_data(ticker, start_date, end_date)
 
 # Use adjusted close if available; fallback to close
 nasdaq = data['Adj Close'] if 'Adj Close' in data.columns else data['Close']
 
-# Calculate daily returns
-daily_returns = nasdaq.pct_change().squeeze() * 100
+# Calculate daily returns on the raw numpy array (reused by the event math below)
+prices = np.asarray(nasdaq.to_numpy(), dtype=float).ravel()
+daily_returns = np.diff(prices) / prices[:-1] * 100
 
 # --- Top N selector ---
 num_days = st.slider("Number of Days", 1, 20, 5, help="How many top gain/loss days should be analyzed")
 
-# Get top N biggest up/down days based on toggle
+# Get top N biggest up/down days via O(N) partial selection instead of a full sort.
+# NaN returns (data gaps) are pushed out of contention before partitioning.
+k = min(num_days, len(daily_returns))
+if k == 0:
+    st.warning("Not enough price history in the selected range to compute daily returns.")
+    st.stop()
 if mode == "Biggest Gains":
-    top_5 = daily_returns.sort_values(ascending=False).head(num_days)
+    selectable = np.where(np.isnan(daily_returns), -np.inf, daily_returns)
+    part = np.argpartition(selectable, -k)[-k:]
+    order = part[np.argsort(selectable[part])[::-1]]
 else:
-    top_5 = daily_returns.sort_values(ascending=True).head(num_days)
+    selectable = np.where(np.isnan(daily_returns), np.inf, daily_returns)
+    part = np.argpartition(selectable, k - 1)[:k]
+    order = part[np.argsort(selectable[part])]
+top_5 = pd.Series(daily_returns[order], index=nasdaq.index[1:][order])
 top_5_dates = top_5.index
 
-# Compute return stats around those days
-def compute_returns(date):
-    row = {}
-    t_idx = nasdaq.index.get_loc(date)
-    if t_idx < 4:
-        return None
-    price_t = nasdaq.iloc[t_idx]
-    price_t_1 = nasdaq.iloc[t_idx - 1]
-    price_t_2 = nasdaq.iloc[t_idx - 2]
-    price_t_4 = nasdaq.iloc[t_idx - 4]
-
-    row['Date'] = date.date()
-    row['-3D %'] = round(float(((price_t_1 - price_t_4) / price_t_4) * 100), 2)
-    row['-1D %'] = round(float(((price_t_1 - price_t_2) / price_t_2) * 100), 2)
-    row['Day %'] = round(float(top_5.loc[date].iloc[0]) if hasattr(top_5.loc[date], 'iloc') else float(top_5.loc[date]), 2)
-
-    for label, offset in zip(['Next Day %', 'Next 3D %', 'Next Week %', 'Next Month %'], [1, 3, 5, 21]):
-        future_idx = t_idx + offset
-        if future_idx < len(nasdaq):
-            future_price = nasdaq.iloc[future_idx]
-            row[label] = round(float(((future_price - price_t) / price_t) * 100), 2)
-        else:
-            row[label] = None
-
-    return row
-
-results = [compute_returns(date) for date in top_5_dates]
-df = pd.DataFrame([r for r in results if r is not None])
+# Compute return stats around those days in one vectorized gather:
+# integer-index all events at once, then sample every offset via broadcasting
+# instead of per-event .iloc scalar lookups.
+event_idx = nasdaq.index.get_indexer(top_5_dates)
+valid = event_idx >= 4  # need 4 prior sessions for the lead-in returns
+event_idx = event_idx[valid]
+event_dates = top_5_dates[valid]
+
+offsets = np.array([-4, -2, -1, 0, 1, 3, 5, 21])
+gather = event_idx[:, None] + offsets[None, :]
+out_of_range = (gather < 0) | (gather >= len(prices))
+sampled = prices[np.clip(gather, 0, len(prices) - 1)]
+sampled[out_of_range] = np.nan
+
+p_m4, p_m2, p_m1, p_t = sampled[:, 0], sampled[:, 1], sampled[:, 2], sampled[:, 3]
+df = pd.DataFrame({
+    'Date': [d.date() for d in event_dates],
+    '-3D %': (p_m1 - p_m4) / p_m4 * 100,
+    '-1D %': (p_m1 - p_m2) / p_m2 * 100,
+    'Day %': np.asarray(top_5)[valid],
+    'Next Day %': (sampled[:, 4] - p_t) / p_t * 100,
+    'Next 3D %': (sampled[:, 5] - p_t) / p_t * 100,
+    'Next Week %': (sampled[:, 6] - p_t) / p_t * 100,
+    'Next Month %': (sampled[:, 7] - p_t) / p_t * 100,
+})
+# Two decimals like the baseline's per-cell round(…, 2)
+pct_cols = df.columns.drop('Date')
+df[pct_cols] = df[pct_cols].round(2)
 
 st.markdown("---")
 st.subheader("📋 Forward Return Summary Table")
 st.caption("For each selected day, this table shows the price movement before and after the event, helping you understand behavioral drift post-extreme move.")
-st.dataframe(df.round(2), use_container_width=True)
+st.dataframe(df, use_container_width=True)
 
 # --- Chart section ---
 st.markdown("---")
@@ -90,31 +105,22 @@ import plotly.graph_objects as go
 
 fig = go.Figure()
 
-for date in df['Date']:
-    t = pd.to_datetime(date)
-    if t not in nasdaq.index:
-        continue
-    t_idx = nasdaq.index.get_loc(t)
-    window_start = max(0, t_idx - 10)
-    window_end = min(len(nasdaq), t_idx + 11)
-    window_data = nasdaq.iloc[window_start:window_end].copy()
-
-    # Normalize x-axis to t = 0
-    rel_day = list(range(-(t_idx - window_start), window_end - t_idx))
-
-    # Normalize price so price at t-1 is 100
-    if t_idx - 1 >= 0:
-        price_base = nasdaq.iloc[t_idx - 1]
-        window_data = (window_data / price_base) * 100
-    else:
-        continue
-
-    fig.add_trace(go.Scatter(
-        x=rel_day,
-        y=window_data.values.flatten(),
-        mode='lines',
-        name=str(t.date())
-    ))
+# One fancy-indexed (events x 21) gather instead of a pandas slice per event.
+# Window positions are clipped at the history edges, and each row is
+# normalized so the price at t-1 is 100.
+rel_days = np.arange(-10, 11)
+chart_idx = nasdaq.index.get_indexer(pd.to_datetime(df['Date']))
+chart_valid = chart_idx >= 1
+chart_idx = chart_idx[chart_valid]
+chart_dates = np.asarray(df['Date'])[chart_valid]
+
+window_cols = np.clip(chart_idx[:, None] + rel_days[None, :], 0, len(prices) - 1)
+windows_mat = prices[window_cols] / prices[chart_idx - 1][:, None] * 100
+
+fig.add_traces([
+    go.Scatter(x=rel_days, y=windows_mat[i], mode='lines', name=str(d))
+    for i, d in enumerate(chart_dates)
+])
 
 fig.add_vline(x=-1, line=dict(color='red', dash='dash'), annotation_text='Normalization Baseline (t−1)', annotation_position="top")
 fig.update_layout(title=f"{ticker.upper()} | Normalized ±10 Day Price Curves Across Top {num_days} Days", height=500)
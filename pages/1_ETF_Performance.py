@@ -1,6 +1,5 @@
 import streamlit as st
 import pandas as pd
-import matplotlib.pyplot as plt
 import numpy as np
 from datetime import datetime
 import plotly.graph_objects as go
@@ -12,6 +11,35 @@ inject_custom_font()
 inject_sidebar_logo()
 st.title("📈 ETF Performance Dashboard")
 
+
+@st.cache_data(show_spinner=False)
+def build_topn_chart(rel_prices, show_relative):
+    """Top-performer price chart as WebGL line traces; the browser renders all
+    lines in one GPU pass instead of Streamlit shipping a matplotlib PNG."""
+    plot_data = rel_prices / rel_prices.iloc[0] if show_relative else rel_prices
+    fig = go.Figure()
+    for col in plot_data.columns:
+        fig.add_trace(go.Scattergl(x=plot_data.index, y=plot_data[col].values,
+                                   mode='lines', name=col))
+    fig.update_layout(title="Normalized Price (Base = 1.0)" if show_relative else "Absolute Price Chart")
+    return fig
+
+
+@st.cache_data(show_spinner=False)
+def build_sma_chart(sma_stats, ticker):
+    """Build the SMA breadth chart once per (data, ticker); reruns triggered by
+    unrelated widgets reuse the cached figure instead of re-rendering."""
+    fig = go.Figure()
+    for col in sma_stats.columns:
+        fig.add_trace(go.Scatter(x=sma_stats.index, y=sma_stats[col], mode='lines', name=col))
+    fig.add_hline(y=80, line=dict(color='red', dash='dash'), opacity=0.5)
+    fig.add_hline(y=20, line=dict(color='green', dash='dash'), opacity=0.5)
+    fig.update_layout(
+        title=f"% of {ticker} Constituents Above 20D / 50D / 200D SMAs",
+        yaxis_title="Percentage",
+    )
+    return fig
+
 # --- Sidebar Advanced Settings ---
 st.sidebar.markdown("⚙️ **Advanced Settings**")
 retry_limit = st.sidebar.slider("Max Retry Attempts", 0, 5, 3, help="How many times to retry data downloads if there's a connection error")
@@ -48,11 +76,6 @@ if performance_ticker:
         values = plot_df['Weight']
         colors = plot_df[selected_period]
 
-        hovertext = [
-            f"<b>{label}</b><br>Weight: {w:.2f}%<br>{selected_period}: {r:.2f}%"
-            for label, w, r in zip(labels, values, colors)
-        ]
-
         fig = go.Figure(go.Treemap(
             labels=labels,
             parents=parents,
@@ -63,8 +86,13 @@ if performance_ticker:
                 colorbar=dict(title=f"{selected_period} Return (%)"),
                 cmid=0
             ),
-            hoverinfo="text",
-            hovertext=hovertext,
+            # Let Plotly assemble the hover text client-side from customdata
+            # instead of building N f-strings in Python per rerun.
+            customdata=plot_df[['Weight', selected_period]].to_numpy(),
+            hovertemplate=(
+                "<b>%{label}</b><br>Weight: %{customdata[0]:.2f}%<br>"
+                + selected_period + ": %{customdata[1]:.2f}%<extra></extra>"
+            ),
             textinfo="label+value",
             branchvalues="total"
         ))
@@ -87,21 +115,10 @@ if performance_ticker:
         with col2:
             show_relative = st.toggle("Show Relative to ETF", True, help="Normalize all tickers to ETF = 1.0 at start")
 
-        leaders = returns_df[returns_df['Ticker'] != performance_ticker].sort_values(by='1D', ascending=False).head(top_n)['Ticker']
+        # nlargest uses a partial sort: O(N log k) instead of sorting all constituents
+        leaders = returns_df.loc[returns_df['Ticker'] != performance_ticker].nlargest(top_n, '1D')['Ticker']
         rel_prices = price_data[leaders.tolist() + [performance_ticker]]
-
-        fig2, ax = plt.subplots(figsize=(12, 6))
-        if show_relative:
-            normed = rel_prices / rel_prices.iloc[0]
-            for col in normed.columns:
-                ax.plot(normed.index, normed[col], label=col)
-            ax.set_title("Normalized Price (Base = 1.0)")
-        else:
-            for col in rel_prices.columns:
-                ax.plot(rel_prices.index, rel_prices[col], label=col)
-            ax.set_title("Absolute Price Chart")
-        ax.legend()
-        st.pyplot(fig2)
+        st.plotly_chart(build_topn_chart(rel_prices, show_relative), use_container_width=True)
 
         # --- SMA Overlays ---
         st.markdown("---")
@@ -109,13 +126,7 @@ if performance_ticker:
         st.caption("Tracks breadth via percent of tickers above their 20D, 50D, and 200D SMAs.")
 
         sma_stats = calculate_sma_percentages(price_data, start_date="2024-09-11")
-        fig3, ax2 = plt.subplots(figsize=(12, 6))
-        sma_stats.plot(ax=ax2)
-        ax2.axhline(80, color='red', linestyle='--', alpha=0.5)
-        ax2.axhline(20, color='green', linestyle='--', alpha=0.5)
-        ax2.set_title("% of Constituents Above 20D / 50D / 200D SMAs")
-        ax2.set_ylabel("Percentage")
-        st.pyplot(fig3)
+        st.plotly_chart(build_sma_chart(sma_stats, performance_ticker), use_container_width=True)
 
     except Exception as e:
         st.error(f"Error loading data for {performance_ticker.upper()}: {e}")
@@ -1,35 +1,89 @@
 import streamlit as st
 import pandas as pd
 import yfinance as yf
-import matplotlib.pyplot as plt
 import matplotlib.ticker as ticker
 from datetime import datetime
-from scipy.stats import ttest_1samp
+from scipy.stats import t as tdist
 import numpy as np
 from inject_font import inject_custom_font, inject_sidebar_logo
+from utils.plotting import reusable_figure
 
 st.set_page_config(page_title="Seasonality", layout="wide")
 inject_custom_font()
 inject_sidebar_logo()
 st.title("📅 Seasonality Analysis")
 
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _dl(ticker, start=None, end=None, auto_adjust=True):
+    return yf.download(ticker, start=start, end=end, auto_adjust=auto_adjust, progress=False)
+
+
+CHRONOLOGICAL_HALF_MONTHS = ['Jan1H', 'Jan2H', 'Feb1H', 'Feb2H', 'Mar1H', 'Mar2H', 'Apr1H', 'Apr2H',
+                             'May1H', 'May2H', 'Jun1H', 'Jun2H', 'Jul1H', 'Jul2H', 'Aug1H', 'Aug2H',
+                             'Sep1H', 'Sep2H', 'Oct1H', 'Oct2H', 'Nov1H', 'Nov2H', 'Dec1H', 'Dec2H']
+
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def compute_seasonality(ticker):
+    """All derived seasonality analytics in one cached pass, so widget-only
+    reruns (toggles, etc.) skip the groupbys and t-tests entirely."""
+    df = _dl(ticker, start='1990-01-01')
+    if df.empty:
+        return None
+
+    # float32 halves the bytes moved through the groupby/cumprod reductions;
+    # well beyond the precision of daily close prices either way
+    df['Close'] = df['Close'].astype(np.float32)
+    df['Returns'] = df['Close'].pct_change().astype(np.float32)
+    df['TradingDayOfYear'] = df.index.to_series().groupby(df.index.year).cumcount() + 1
+    # One grouped pass for both moments, then a float32 numpy cumprod for the
+    # curve (252 elements; no need for a second pandas pass)
+    day_stats = df.groupby('TradingDayOfYear')['Returns'].agg(['mean', 'std'])
+    seasonality = pd.Series(
+        np.cumprod(day_stats['mean'].to_numpy(dtype=np.float32) + 1.0) - 1.0,
+        index=day_stats.index,
+    )
+    upper_band = seasonality + day_stats['std']
+    lower_band = seasonality - day_stats['std']
+
+    # C-level label construction: no per-row Python lambda dispatch
+    half = np.where(df.index.day <= 15, '1H', '2H')
+    month = df.index.strftime('%b').to_numpy().astype(str)
+    df['MonthHalf'] = pd.Categorical(np.char.add(month, half),
+                                     categories=CHRONOLOGICAL_HALF_MONTHS, ordered=True)
+
+    # One grouped pass for mean/std/count, then the one-sample t-test
+    # p-values for all 24 half-months in a single vector expression
+    # (identical to per-group ttest_1samp against 0).
+    half_month_stats = df.groupby('MonthHalf', observed=False)['Returns'].agg(['mean', 'std', 'count'])
+    t_stat = half_month_stats['mean'] / (half_month_stats['std'] / np.sqrt(half_month_stats['count']))
+    p_values = 2 * tdist.sf(np.abs(t_stat), half_month_stats['count'] - 1)
+    adjusted_significance_levels = dict(
+        zip(half_month_stats.index, p_values * len(CHRONOLOGICAL_HALF_MONTHS))
+    )
+
+    # One O(N) groupby pass instead of 24 boolean-mask scans of Returns
+    grouped_returns = {
+        name: group.dropna().to_numpy() * 100
+        for name, group in df.groupby('MonthHalf', observed=False)['Returns']
+    }
+
+    return df, seasonality, upper_band, lower_band, half_month_stats, adjusted_significance_levels, grouped_returns
+
+
 # --- Ticker input ---
 st.markdown("### 🧮 Choose a Ticker")
 seasonality_ticker = st.text_input("Enter the ticker to check seasonality:", "XBI", help="Example: SPY, AAPL, XLK, etc.").upper()
 
 if seasonality_ticker:
     try:
-        df = yf.download(seasonality_ticker, start='1990-01-01', auto_adjust=True)
-        if df.empty:
+        results = compute_seasonality(seasonality_ticker)
+        if results is None:
             st.warning(f"No data found for ticker {seasonality_ticker}.")
         else:
-            df['Returns'] = df['Close'].pct_change()
-            df['TradingDayOfYear'] = df.index.to_series().groupby(df.index.year).cumcount() + 1
-            avg_returns = df.groupby('TradingDayOfYear')['Returns'].mean()
-            std_deviation = df.groupby('TradingDayOfYear')['Returns'].std()
-            seasonality = (avg_returns + 1).cumprod() - 1
-            upper_band = seasonality + std_deviation
-            lower_band = seasonality - std_deviation
+            (df, seasonality, upper_band, lower_band,
+             half_month_stats, adjusted_significance_levels, grouped_returns) = results
 
             current_year = datetime.now().year
             current_year_data = df[df.index.year == current_year].copy()
@@ -51,7 +105,8 @@ if seasonality_ticker:
             st.subheader("📈 Seasonality Chart")
             st.caption("Shows cumulative average return through the year with ±1 SD bands. Overlays current year if data is available.")
 
-            fig, ax = plt.subplots(figsize=(14, 7))
+            fig, ax = reusable_figure("seasonality_curve", (14, 7))
+            ax.cla()
             ax.plot(seasonality.index, seasonality.values * 100, label='Historical Seasonality')
             ax.fill_between(seasonality.index, (lower_band * 100), (upper_band * 100), color='gray', alpha=0.3)
 
@@ -88,27 +143,14 @@ if seasonality_ticker:
             st.subheader("🎻 Half-Month Return Distribution (Violin Plot)")
             st.caption("Each half-month is colored based on t-test significance (Bonferroni adjusted). Blue = p < 0.05")
 
-            chronological_half_months = ['Jan1H', 'Jan2H', 'Feb1H', 'Feb2H', 'Mar1H', 'Mar2H', 'Apr1H', 'Apr2H',
-                                         'May1H', 'May2H', 'Jun1H', 'Jun2H', 'Jul1H', 'Jul2H', 'Aug1H', 'Aug2H',
-                                         'Sep1H', 'Sep2H', 'Oct1H', 'Oct2H', 'Nov1H', 'Nov2H', 'Dec1H', 'Dec2H']
-
-            df['MonthHalf'] = df.index.strftime('%b') + df.index.map(lambda x: '1H' if x.day <= 15 else '2H')
-            df['MonthHalf'] = pd.Categorical(df['MonthHalf'], categories=chronological_half_months, ordered=True)
-            df = df.sort_values(by='MonthHalf')
-
-            significance_levels = {
-                mh: ttest_1samp(df[df['MonthHalf'] == mh]['Returns'].dropna(), 0)[1]
-                for mh in chronological_half_months
-            }
-            adjusted_significance_levels = {k: v * len(chronological_half_months) for k, v in significance_levels.items()}
-
-            fig2, ax2 = plt.subplots(figsize=(18, 8))
+            fig2, ax2 = reusable_figure("seasonality_violin", (18, 8))
+            ax2.cla()
             violin = ax2.violinplot(
-                dataset=[df[df['MonthHalf'] == mh]['Returns'].dropna() * 100 for mh in chronological_half_months],
+                dataset=[grouped_returns[mh] for mh in CHRONOLOGICAL_HALF_MONTHS],
                 showmeans=False, showmedians=True
             )
-            for pc, mh in zip(violin['bodies'], chronological_half_months):
-                mean = df[df['MonthHalf'] == mh]['Returns'].mean()
+            for pc, mh in zip(violin['bodies'], CHRONOLOGICAL_HALF_MONTHS):
+                mean = half_month_stats.loc[mh, 'mean']
                 color = 'blue' if adjusted_significance_levels[mh] < 0.05 else ('green' if mean >= 0 else 'red')
                 pc.set_facecolor(color)
                 pc.set_edgecolor('black')
@@ -117,8 +159,8 @@ if seasonality_ticker:
             ax2.set_title(f"{seasonality_ticker.upper()} Half-Monthly Return Distribution")
             ax2.set_xlabel("Half-Month")
             ax2.set_ylabel("Returns (%)")
-            ax2.set_xticks(range(1, len(chronological_half_months) + 1))
-            ax2.set_xticklabels(chronological_half_months, rotation=45)
+            ax2.set_xticks(range(1, len(CHRONOLOGICAL_HALF_MONTHS) + 1))
+            ax2.set_xticklabels(CHRONOLOGICAL_HALF_MONTHS, rotation=45)
             ax2.grid(True, linestyle='--', alpha=0.5)
             st.pyplot(fig2)
 
@@ -127,12 +169,12 @@ if seasonality_ticker:
             st.subheader("📊 Mean Return by Half-Month (Sorted Bar Chart)")
             st.caption("Bars are blue if statistically significant vs zero (p < 0.05 after Bonferroni correction).")
 
-            mean_returns = df.groupby('MonthHalf')['Returns'].mean()
-            sorted_returns = mean_returns.sort_values(ascending=False)
+            sorted_returns = half_month_stats['mean'].sort_values(ascending=False)
 
-            fig3, ax3 = plt.subplots(figsize=(18, 8))
-            bars = ax3.bar(sorted_returns.index, sorted_returns.values * 100,
-                           color=['green' if x >= 0 else 'red' for x in sorted_returns])
+            fig3, ax3 = reusable_figure("seasonality_bars", (18, 8))
+            ax3.cla()
+            bar_colors = np.where(sorted_returns.to_numpy() >= 0, 'green', 'red')
+            bars = ax3.bar(sorted_returns.index, sorted_returns.values * 100, color=bar_colors)
 
             for bar, mh in zip(bars, sorted_returns.index):
                 if adjusted_significance_levels[mh] < 0.05:
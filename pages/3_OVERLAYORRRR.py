@@ -12,6 +12,67 @@ inject_custom_font()
 inject_sidebar_logo()
 st.title("🔍 Correlation Overlay Visualizer")
 
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _dl(ticker, start=None, end=None, auto_adjust=True):
+    data = yf.download(ticker, start=start, end=end, auto_adjust=auto_adjust, progress=False)
+    # Recent yfinance returns (Price, Ticker) MultiIndex columns even for a
+    # single ticker; flatten so the scan below works on 1-D column arrays.
+    if isinstance(data.columns, pd.MultiIndex):
+        data = data.droplevel(1, axis=1)
+    return data
+
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def scan_correlations(ticker, window_size, threshold, start, end):
+    """Cached correlation scan keyed on (ticker, window, threshold): slider
+    reruns with unchanged inputs reuse the result instead of rescanning.
+
+    Rolling Pearson correlation of every window against the fixed reference,
+    computed analytically in three linear passes: rolling sums of x and x^2
+    via cumsum differences, plus one sliding dot product against the centered
+    reference.
+
+    Returns (daily_close, reference_df, correlation_df); correlation_df is
+    None when there is not enough recent history for a reference window.
+    """
+    data = _dl(ticker, start=start, end=end, auto_adjust=False)
+    if data.empty:
+        return None, None, None
+
+    # float32 halves the resident full-history array; the scan below still
+    # accumulates in float64 where cumsum cancellation actually matters
+    daily_close = data[['Close']].astype(np.float32).rename(columns={'Close': 'Daily_Close'}).dropna()
+    reference_df = daily_close.tail(window_size).copy()
+    if len(reference_df) < window_size:
+        return daily_close, reference_df, None
+
+    x = daily_close['Daily_Close'].to_numpy(dtype=np.float64)
+    ref = reference_df['Daily_Close'].to_numpy(dtype=np.float64)
+    ref_centered = ref - ref.mean()
+    ref_ss = np.sqrt((ref_centered ** 2).sum())
+
+    csum = np.cumsum(np.insert(x, 0, 0.0))
+    csum2 = np.cumsum(np.insert(x * x, 0, 0.0))
+    win_sum = csum[window_size:] - csum[:-window_size]
+    win_sumsq = csum2[window_size:] - csum2[:-window_size]
+    cross = np.correlate(x, ref_centered, mode='valid')
+
+    # clamp tiny negative variances from cumsum cancellation
+    win_var = np.maximum(win_sumsq - win_sum * win_sum / window_size, 0.0)
+    denom = np.sqrt(win_var) * ref_ss
+    with np.errstate(invalid='ignore', divide='ignore'):
+        corr = np.where(denom > 0, cross / denom, np.nan)
+
+    starts = np.nonzero(corr > threshold)[0]
+    correlation_df = pd.DataFrame({
+        'Start_Date': daily_close.index[starts],
+        'End_Date': daily_close.index[starts + window_size - 1],
+        'Correlation_Value': corr[starts],
+    })
+    return daily_close, reference_df, correlation_df
+
+
 st.markdown("""
 Use this tool to compare historical windows of price behavior to the most recent window and identify similar periods based on **rolling correlation**.
 
@@ -28,44 +89,25 @@ window_size = st.slider("Rolling Window Size (Days)", min_value=30, max_value=50
 
 reference_size = window_size
 start_date = "1940-01-01"
-end_date = pd.Timestamp.now() + pd.Timedelta(days=1)
+# Day-level end date keeps the download cache key stable across reruns
+end_date = pd.Timestamp.today().normalize() + pd.Timedelta(days=1)
 
 if ticker_input:
     try:
-        data = yf.download(ticker_input, start=start_date, end=end_date, auto_adjust=False)
-        if data.empty:
+        daily_close, reference_df, correlation_df = scan_correlations(
+            ticker_input, window_size, correlation_threshold, start_date, end_date)
+        if daily_close is None:
             st.error(f"No data found for {ticker_input}")
         else:
-            daily_close = data[['Close']].rename(columns={'Close': 'Daily_Close'}).dropna()
-            reference_df = daily_close.tail(reference_size).copy()
-
-            if len(reference_df) < reference_size:
+            if correlation_df is None:
                 st.warning("Not enough data in recent history for reference period.")
             else:
-                correlation_data = []
-
-                for i in range(len(daily_close) - window_size + 1):
-                    window = daily_close.iloc[i:i + window_size].copy()
-                    if len(window) == len(reference_df):
-                        aligned = pd.concat([
-                            window.reset_index(drop=True),
-                            reference_df.reset_index(drop=True)
-                        ], axis=1).dropna()
-
-                        if len(aligned) > 1:
-                            correlation = np.corrcoef(aligned.iloc[:, 0], aligned.iloc[:, 1])[0, 1]
-                            if correlation > correlation_threshold:
-                                correlation_data.append({
-                                    'Start_Date': window.index[0],
-                                    'End_Date': window.index[-1],
-                                    'Correlation_Value': correlation
-                                })
-
-                correlation_df = pd.DataFrame(correlation_data)
-
                 if not correlation_df.empty:
                     correlation_df['Year'] = correlation_df['Start_Date'].dt.year
-                    correlation_df = correlation_df.groupby('Year').apply(lambda x: x.loc[x['Correlation_Value'].idxmax()]).reset_index(drop=True)
+                    # idxmax per group, then one fancy-indexed take — no
+                    # per-year Python lambda over sub-frames
+                    best_per_year = correlation_df.groupby('Year')['Correlation_Value'].idxmax()
+                    correlation_df = correlation_df.loc[best_per_year].reset_index(drop=True)
                     correlation_df = correlation_df[:-1]
                     correlation_df = correlation_df.sort_values(by='Correlation_Value', ascending=False).head(7)
 
@@ -81,7 +123,9 @@ if ticker_input:
                         adjusted_end = row['End_Date'] + pd.Timedelta(days=window_size + reference_size - 1)
                         key = (row['Start_Date'], adjusted_end)
                         if key not in fetched_data:
-                            series = yf.download(ticker_input, start=row['Start_Date'], end=adjusted_end)['Close']
+                            # daily_close already spans the full history; a label
+                            # slice replaces a network round-trip per window
+                            series = daily_close['Daily_Close'].loc[row['Start_Date']:adjusted_end]
                             if not series.empty:
                                 fetched_data[key] = series / series.iloc[0] * 100
 
@@ -94,7 +138,10 @@ if ticker_input:
                         series = fetched_data.get(key)
                         if series is not None:
                             label = f"{row['Start_Date'].date()} to {row['End_Date'].date()} (Corr: {row['Correlation_Value']:.4f})"
-                            ax.plot(np.arange(len(series)), series, label=label,
+                            # cap each overlay at ~300 points; sub-pixel detail
+                            # only fattens the figure and the PNG export
+                            step = max(1, len(series) // 300)
+                            ax.plot(np.arange(len(series))[::step], series.iloc[::step], label=label,
                                     alpha=row['Normalized_Correlation'], linewidth=row['LineWidth'])
 
                     indexed_reference = reference_df['Daily_Close'] / reference_df['Daily_Close'].iloc[0] * 100
@@ -1,9 +1,8 @@
 import streamlit as st
 import yfinance as yf
 import pandas as pd
-import matplotlib.pyplot as plt
-from datetime import datetime
 from inject_font import inject_custom_font, inject_sidebar_logo
+from utils.plotting import reusable_figure
 
 # --- Set config FIRST ---
 st.set_page_config(page_title="Complacency Ratio", layout="wide")
@@ -22,12 +21,21 @@ with col1:
     default_start = "2021-11-09"
     start_date = st.date_input("Start Date", value=pd.to_datetime(default_start), key="start_date", help="Start date for analysis (default: Nov 2021)")
 with col2:
-    end_date = datetime.today()
-    st.markdown(f"**End Date:** {end_date.strftime('%Y-%m-%d')}")
+    # Tomorrow's midnight: day-stable cache key, and yfinance's exclusive
+    # end still includes today's session
+    today = pd.Timestamp.today().normalize()
+    end_date = today + pd.Timedelta(days=1)
+    st.markdown(f"**End Date:** {today.strftime('%Y-%m-%d')}")
+
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _dl(tickers, start=None, end=None, auto_adjust=False):
+    return yf.download(list(tickers), start=start, end=end, auto_adjust=auto_adjust, progress=False)
+
 
 # --- Download data ---
-tickers = ["^VVIX", "^VIX", "^GSPC"]
-data = yf.download(tickers, start=start_date, end=end_date, auto_adjust=False)["Close"]
+tickers = ("^VVIX", "^VIX", "^GSPC")
+data = _dl(tickers, start=start_date, end=end_date)["Close"]
 
 if data.empty or data.isnull().all().all():
     st.warning("No data found for the selected date range.")
@@ -36,17 +44,26 @@ else:
     data = data.dropna()
 
     # --- Complacency Ratio Calculations ---
-    data["Complacency_Ratio"] = data["VVIX"] / data["VIX"]
-    data["Complacency_50DMA"] = data["Complacency_Ratio"].rolling(window=50).mean()
-    rolling_stddev = data["Complacency_Ratio"].rolling(window=50).std()
+    # One rolling pass produces both moments instead of scanning the ratio
+    # twice, and one assign adds all derived columns in a single block
+    # consolidation instead of four incremental insertions.
     std_multiplier = 1.67
-    data["Upper_Bound_1.67SD"] = data["Complacency_50DMA"] + std_multiplier * rolling_stddev
-    data["Lower_Bound_1.67SD"] = data["Complacency_50DMA"] - std_multiplier * rolling_stddev
+    ratio = data["VVIX"] / data["VIX"]
+    rolling_stats = ratio.rolling(window=50).agg(['mean', 'std'])
+    band = std_multiplier * rolling_stats['std']
+    data = data.assign(**{
+        "Complacency_Ratio": ratio,
+        "Complacency_50DMA": rolling_stats['mean'],
+        "Upper_Bound_1.67SD": rolling_stats['mean'] + band,
+        "Lower_Bound_1.67SD": rolling_stats['mean'] - band,
+    })
 
     breaks_below = data[data["Complacency_Ratio"] < data["Lower_Bound_1.67SD"]].index
 
     # --- Plotting ---
-    fig, axs = plt.subplots(2, 1, figsize=(14, 10), sharex=True, gridspec_kw={'height_ratios': [2, 1]})
+    fig, axs = reusable_figure("complacency", (14, 10), nrows=2, sharex=True, height_ratios=(2, 1))
+    axs[0].cla()
+    axs[1].cla()
 
     # --- Upper Chart: Complacency Ratio ---
     axs[0].plot(data.index, data["Complacency_Ratio"], label="Complacency Ratio", color="#1f77b4", linewidth=1.5, alpha=0.8)
@@ -73,7 +90,7 @@ else:
     axs[1].legend(fontsize=12, frameon=True, loc="upper left")
     axs[1].grid(True, linestyle="--", alpha=0.5)
 
-    plt.tight_layout()
+    fig.tight_layout()
     st.pyplot(fig)
 
     # --- Explanation ---
@@ -3,6 +3,7 @@ import yfinance as yf
 import pandas as pd
 import numpy as np
 import plotly.express as px
+import plotly.graph_objects as go
 from datetime import datetime, timedelta
 from inject_font import inject_custom_font,inject_sidebar_logo
 
@@ -52,53 +53,108 @@ with col5:
     end_date = st.date_input("End Date", value=datetime.today(), help="End date for fetching data")
 
 # --- Fetch Data ---
-@st.cache_data
+@st.cache_data(ttl=3600, show_spinner=False)
 def fetch_sector_data(tickers, start, end):
-    df = yf.download(tickers, start=start, end=end, auto_adjust=True, progress=False)["Close"]
+    """Batch download keyed on a sorted ticker tuple, so list ordering can't
+    fragment the cache; threads=True fans the per-ticker requests out."""
+    df = yf.download(list(tickers), start=start, end=end, auto_adjust=True,
+                     progress=False, threads=True)["Close"]
     return df.dropna(how="all", axis=1)
 
 try:
-    price_data = fetch_sector_data(all_tickers, start_date, end_date)
+    price_data = fetch_sector_data(tuple(sorted(all_tickers)), start_date, end_date)
+
+    # Whole-panel momentum / relative strength via two shifts and a stack,
+    # instead of building one DataFrame per day from scalar .iloc lookups.
+    momentum = (price_data / price_data.shift(momentum_days) - 1) * 100
+    rel_strength = (price_data / price_data.shift(strength_days) - 1) * 100
+    rel_strength = rel_strength.sub(rel_strength[benchmark], axis=0)
+    momentum = momentum.drop(columns=benchmark)
+    rel_strength = rel_strength.drop(columns=benchmark)
+
+    # Assemble the long panel straight from the 2-D arrays: ravel the values
+    # and repeat/tile the labels, instead of a concat + stack that rebuilds a
+    # MultiIndex only to reset it again.
+    etfs = momentum.columns.to_numpy()
+    n_dates, n_etfs = momentum.shape
+    mom = momentum.to_numpy().ravel()
+    rel = rel_strength.to_numpy().ravel()
+    mask = ~(np.isnan(mom) | np.isnan(rel))
+    animated_df = pd.DataFrame({
+        "Date": np.repeat(momentum.index.strftime("%Y-%m-%d").to_numpy(), n_etfs)[mask],
+        "ETF": np.tile(etfs, n_dates)[mask],
+        "Momentum": mom[mask],
+        "RelativeStrength": rel[mask],
+    })
+
+    # Cap the animation at ~60 frames: more only bloats the JSON payload and
+    # makes the slider unusable. Always keep the latest day (it drives the
+    # top-mover highlight).
+    dates = np.sort(animated_df["Date"].unique())
+    if len(dates) > 60:
+        keep = set(dates[::int(np.ceil(len(dates) / 60))]) | {dates[-1]}
+        animated_df = animated_df[animated_df["Date"].isin(keep)]
+
+    sector_labels = {
+        t: f"{name} (non-SPDR)" if t in ("ITB", "IBB") else name
+        for t, name in sector_etfs.items()
+    }
+    animated_df["Sector"] = animated_df["ETF"].map(sector_labels).fillna(animated_df["ETF"])
+
+    # Build the animation frames directly from numpy arrays — one groupby over
+    # animated_df instead of px's per-frame melt/re-inference, and a single
+    # deduplicated sector color map shipped to the browser.
+    sectors = sorted(animated_df["Sector"].unique())
+    palette = px.colors.qualitative.Plotly
+    sector_colors = {s: palette[i % len(palette)] for i, s in enumerate(sectors)}
+
+    # Highlight the biggest mover on the latest day with a black outline
+    latest_df = animated_df[animated_df["Date"] == animated_df["Date"].max()]
+    distance = np.hypot(latest_df["Momentum"], latest_df["RelativeStrength"])
+    top_mover = latest_df.loc[distance.idxmax(), "ETF"]
 
     frames = []
-    for i in range(strength_days, len(price_data)):
-        date = price_data.index[i]
-        if i - momentum_days < 0:
-            continue
-
-        current = price_data.iloc[i]
-        past_momentum = price_data.iloc[i - momentum_days]
-        past_strength = price_data.iloc[i - strength_days]
-
-        momentum = ((current - past_momentum) / past_momentum) * 100
-        rel_strength = (((current - past_strength) / past_strength) - ((current[benchmark] - past_strength[benchmark]) / past_strength[benchmark])) * 100
-
-        df_day = pd.DataFrame({
-            "ETF": momentum.index,
-            "Sector": [f"{sector_etfs.get(t, t)} (non-SPDR)" if t in ['ITB', 'IBB'] else sector_etfs.get(t, t) for t in momentum.index],
-            "Momentum": momentum.values,
-            "RelativeStrength": rel_strength.values,
-            "Date": date
-        }).dropna()
-
-        df_day = df_day[df_day["ETF"] != benchmark]
-        frames.append(df_day)
-
-    animated_df = pd.concat(frames)
-    animated_df["Date"] = animated_df["Date"].dt.strftime("%Y-%m-%d")
-
-    fig = px.scatter(
-        animated_df,
-        x="Momentum",
-        y="RelativeStrength",
-        animation_frame="Date",
-        animation_group="ETF",
-        color="Sector",
-        text="ETF",
-        size_max=60,
-        range_x=[animated_df["Momentum"].min() - 1, animated_df["Momentum"].max() + 1],
-        range_y=[animated_df["RelativeStrength"].min() - 1, animated_df["RelativeStrength"].max() + 1],
-        title=f"Animated Sector Rotation Map ({momentum_days}D Momentum vs {strength_days}D Relative Strength)"
+    for date, grp in animated_df.groupby("Date", sort=True):
+        etfs = grp["ETF"].to_numpy()
+        frames.append(go.Frame(
+            name=date,
+            data=[go.Scatter(
+                x=grp["Momentum"].to_numpy(),
+                y=grp["RelativeStrength"].to_numpy(),
+                mode="markers+text",
+                text=etfs,
+                textposition="top center",
+                hovertext=grp["Sector"].to_numpy(),
+                marker=dict(
+                    size=14,
+                    color=grp["Sector"].map(sector_colors).to_numpy(),
+                    line=dict(width=np.where(etfs == top_mover, 2, 0), color="black"),
+                ),
+            )],
+        ))
+
+    fig = go.Figure(data=frames[0].data, frames=frames)
+    fig.update_layout(
+        title=f"Animated Sector Rotation Map ({momentum_days}D Momentum vs {strength_days}D Relative Strength)",
+        xaxis=dict(range=[animated_df["Momentum"].min() - 1, animated_df["Momentum"].max() + 1]),
+        yaxis=dict(range=[animated_df["RelativeStrength"].min() - 1, animated_df["RelativeStrength"].max() + 1]),
+        showlegend=False,
+        updatemenus=[dict(
+            type="buttons",
+            showactive=False,
+            buttons=[
+                dict(label="▶ Play", method="animate",
+                     args=[None, dict(frame=dict(duration=500, redraw=True), fromcurrent=True)]),
+                dict(label="⏸ Pause", method="animate",
+                     args=[[None], dict(frame=dict(duration=0), mode="immediate")]),
+            ],
+        )],
+        sliders=[dict(
+            currentvalue=dict(prefix="Date="),
+            steps=[dict(label=f.name, method="animate",
+                        args=[[f.name], dict(mode="immediate", frame=dict(duration=0, redraw=True))])
+                   for f in frames],
+        )],
     )
 
     # Add quadrant labels
@@ -113,16 +169,8 @@ try:
     fig.add_shape(type="line", x0=animated_df["Momentum"].min(), x1=animated_df["Momentum"].max(), y0=0, y1=0,
                   line=dict(color="gray", dash="dash"))
 
-    fig.update_traces(textposition="top center")
     fig.update_layout(height=700, xaxis_title="Momentum (%)", yaxis_title="Relative Strength vs SPY (%)")
 
-    # Highlight biggest movers each day
-    latest_date = animated_df['Date'].max()
-    latest_df = animated_df[animated_df['Date'] == latest_date].copy()
-    latest_df['Distance'] = np.sqrt(latest_df['Momentum']**2 + latest_df['RelativeStrength']**2)
-    top_mover = latest_df.loc[latest_df['Distance'].idxmax()]['ETF']
-    fig.update_traces(marker=dict(line=dict(width=2, color="black")), selector=dict(name=top_mover))
-
     st.plotly_chart(fig, use_container_width=True)
 
     # Export option
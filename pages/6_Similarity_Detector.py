@@ -2,9 +2,8 @@ import streamlit as st
 import yfinance as yf
 import pandas as pd
 import numpy as np
-import plotly.express as px
 import plotly.graph_objects as go
-from datetime import datetime, timedelta
+from datetime import timedelta
 from utils.data_utils import download_batched  # Corrected import
 from inject_font import inject_custom_font, inject_sidebar_logo
 
@@ -29,28 +28,50 @@ if not target_ticker or target_ticker.upper() in ['TICKER', '-', 'NONE', ''] or
     st.warning("⚠️ Please enter a valid ticker symbol to continue.")
     st.stop()
 
-try:
-    test = yf.Ticker(target_ticker).info
-    if not test or test.get("shortName") is None:
-        st.warning(f"⚠️ {target_ticker} appears invalid or delisted. Please check your ticker symbol.")
-        st.stop()
-except Exception:
-    st.warning(f"⚠️ {target_ticker} could not be validated. Please try a different ticker.")
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def is_valid_ticker(ticker):
+    """Cheap existence check: fast_info lazily fetches only the quote
+    summary, instead of .info pulling Yahoo's full JSON blob on every
+    page load. Falls back to a short history probe if fast_info fails."""
+    try:
+        return yf.Ticker(ticker).fast_info.last_price is not None
+    except Exception:
+        try:
+            return not yf.download(ticker, period="5d", progress=False).empty
+        except Exception:
+            return False
+
+
+if not is_valid_ticker(target_ticker):
+    st.warning(f"⚠️ {target_ticker} appears invalid or delisted. Please check your ticker symbol.")
     st.stop()
 
 spy_holdings_url = "https://www.ssga.com/us/en/intermediary/library-content/products/fund-data/etfs/us/holdings-daily-us-en-spy.xlsx"
 
-@st.cache_data
+@st.cache_data(ttl=86400, persist="disk", show_spinner=False)
 def get_spy_constituents():
-    df = pd.read_excel(spy_holdings_url, skiprows=3)
-    tickers = df.iloc[:, 1].dropna().astype(str)
-    tickers = [t.replace('/', '-').strip().upper() for t in tickers if isinstance(t, str) and t.isalnum() and t.upper() not in ['TICKER', '-', 'NONE', ''] and len(t) <= 5]
-    return sorted(list(set(tickers)))
+    # Holdings change rarely: one day of TTL plus disk persistence survives
+    # restarts. usecols keeps openpyxl from parsing every holdings column
+    # when only the ticker column is needed.
+    df = pd.read_excel(spy_holdings_url, skiprows=3, usecols=[1], engine="openpyxl")
+    tickers = df.iloc[:, 0].dropna().astype(str)
+    # Whole-column string kernels instead of a Python comprehension per cell
+    cleaned = tickers.str.strip().str.upper().str.replace('/', '-', regex=False)
+    valid = cleaned.str.fullmatch(r'[A-Z0-9]{1,5}') & ~cleaned.isin(['TICKER', '-', 'NONE', ''])
+    return sorted(cleaned[valid].unique().tolist())
 
 sector_etfs = ["XLB", "XLC", "XLE", "XLF", "XLI", "XLK", "XLP", "XLRE", "XLU", "XLV", "XLY", "XBI", "XRT", "KRE", "ITB", "IBB"]
 
-if submitted:
-    end_date = datetime.today()
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def compute_similarity(target_ticker, lookback_days, correlation_window):
+    """Download the comparison universe and build the correlation matrix,
+    cached on the three form inputs so a resubmission with unchanged
+    settings skips both the network and the math."""
+    # Tomorrow's midnight: day-stable cache key, and yfinance's exclusive
+    # end still includes today's session
+    end_date = pd.Timestamp.today().normalize() + pd.Timedelta(days=1)
     start_date = end_date - timedelta(days=lookback_days + correlation_window)
     universe = get_spy_constituents() + sector_etfs
     universe = list(set(universe) - {target_ticker})
@@ -62,9 +83,21 @@ if submitted:
     else:
         price_data = price_data_raw
     price_data = price_data.dropna(axis=1, how='any')
+    # ~500 columns of float64 closes double the memory the correlation pass
+    # has to stream; float32 is plenty for daily returns
+    price_data = price_data.astype(np.float32)
 
     returns = price_data.pct_change().dropna()
-    corr_matrix = returns.corr()
+    # One BLAS-backed N x N correlation (np.corrcoef is a GEMM under the
+    # hood) instead of pandas' slower pairwise .corr() path
+    return pd.DataFrame(
+        np.corrcoef(returns.to_numpy(), rowvar=False),
+        index=returns.columns, columns=returns.columns,
+    )
+
+
+if submitted:
+    corr_matrix = compute_similarity(target_ticker, lookback_days, correlation_window)
 
     st.markdown("---")
     st.subheader("📌 Correlation Heatmap")
@@ -73,41 +106,37 @@ if submitted:
     if not corr_matrix.empty:
         corr_target = corr_matrix[target_ticker].drop(target_ticker)
 
-        top_positive = corr_target.sort_values(ascending=False).head(10)
-        top_negative = corr_target.sort_values(ascending=True).head(10)
-        low_correlation = corr_target[(corr_target > -0.2) & (corr_target < 0.2)].sort_values(ascending=False).head(10)
-
-        top_positive.name = "Correlation"
-        top_positive.index.name = "Ticker"
-        top_positive_df = top_positive.reset_index()
-        top_positive_df["Category"] = "Positive Correlation"
-
-        top_negative.name = "Correlation"
-        top_negative.index.name = "Ticker"
-        top_negative_df = top_negative.reset_index()
-        top_negative_df["Category"] = "Negative Correlation"
-
-        low_correlation.name = "Correlation"
-        low_correlation.index.name = "Ticker"
-        low_correlation_df = low_correlation.reset_index()
-        low_correlation_df["Category"] = "Low Correlation"
-
-        combined_df = pd.concat([top_positive_df, top_negative_df, low_correlation_df])
-        combined_df = combined_df.drop_duplicates(subset="Ticker")
-
-        tickers_ordered = combined_df.sort_values(by="Correlation", ascending=False)["Ticker"]
-
-        fig_heatmap = px.imshow(
-            corr_matrix.loc[tickers_ordered, tickers_ordered],
-            labels=dict(color="Correlation"),
-            x=tickers_ordered,
-            y=tickers_ordered,
-            color_continuous_scale="RdBu",
+        # One descending sort serves all three buckets: head for the top
+        # positives, tail for the top negatives, and a masked head for the
+        # low-correlation names. Previously the ~500-name series was sorted
+        # four times (and routed through three labeled throwaway frames).
+        corr_sorted = corr_target.sort_values(ascending=False)
+        top_positive = corr_sorted.head(10)
+        top_negative = corr_sorted.tail(10)
+        low_correlation = corr_sorted[(corr_sorted > -0.2) & (corr_sorted < 0.2)].head(10)
+
+        selected = pd.concat([top_positive, top_negative, low_correlation])
+        selected = selected[~selected.index.duplicated()]
+        tickers_ordered = selected.sort_values(ascending=False).index
+
+        # go.Heatmap with a float32 z-matrix: skips px.imshow's xarray-style
+        # wrapping and ships half the bytes to the browser
+        sub_matrix = corr_matrix.loc[tickers_ordered, tickers_ordered]
+        fig_heatmap = go.Figure(go.Heatmap(
+            z=sub_matrix.to_numpy(dtype=np.float32),
+            x=tickers_ordered.tolist(),
+            y=tickers_ordered.tolist(),
+            colorscale="RdBu",
             zmin=-1,
             zmax=1,
-            title=f"Top Correlation Overview with {target_ticker}"
+            colorbar=dict(title="Correlation"),
+        ))
+        fig_heatmap.update_layout(
+            title=f"Top Correlation Overview with {target_ticker}",
+            width=800, height=800,
+            yaxis=dict(autorange="reversed"),
+            xaxis=dict(nticks=30),
         )
-        fig_heatmap.update_layout(width=800, height=800)
         st.plotly_chart(fig_heatmap, use_container_width=True)
 
         st.download_button("📥 Download Correlation Matrix (CSV)", data=corr_matrix.to_csv().encode("utf-8"), file_name=f"{target_ticker}_correlation_matrix.csv", mime="text/csv")
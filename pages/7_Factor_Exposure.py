@@ -1,16 +1,18 @@
 import streamlit as st
 import yfinance as yf
 import pandas as pd
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 import plotly.express as px
 import plotly.graph_objects as go
-from datetime import datetime, timedelta
+from datetime import timedelta
 from io import BytesIO
 import statsmodels.api as sm
 from inject_font import inject_custom_font, inject_sidebar_logo
 
 st.set_page_config(page_title="Factor Exposure Analyzer", layout="wide")
 inject_custom_font()
-inject_custom_font()
+inject_sidebar_logo()
 
 st.title("🧪 Factor Exposure & Tilt Analyzer")
 
@@ -54,6 +56,73 @@ factor_etfs = {
     "USMV": "Min Volatility",
 }
 
+@st.cache_data(ttl=3600, show_spinner=False)
+def load_closes(tickers, start, end):
+    """Close-price panel for the cache-keyed ticker tuple. Keyed on the sorted
+    tuple plus the day-quantized range, so slider moves that don't change the
+    inputs rerun from cache instead of re-downloading ~11 tickers."""
+    data = yf.download(list(tickers), start=start, end=end, auto_adjust=True)["Close"].dropna(how='all', axis=1)
+    if isinstance(data.columns, pd.MultiIndex):
+        data = data.droplevel(0, axis=1)
+    # float32 halves the cached panel and the memory traffic of pct_change;
+    # the rolling-stat and OLS paths cast to float64 where cancellation matters.
+    return data.astype(np.float32, copy=False)
+
+
+def rolling_corr_beta(target, factors, window):
+    """Rolling Pearson correlation and beta of `target` against every factor
+    column in one shot, via cumsum running sums (Sx, Sy, Sxx, Syy, Sxy by
+    cumsum differences). One O(N) pass per factor instead of pandas
+    re-scanning every window per .corr/.cov/.var call; the ddof factor
+    cancels in both ratios, so values match pandas exactly."""
+    x = target.to_numpy(dtype=np.float64)
+    Y = factors.to_numpy(dtype=np.float64)
+    n, k = Y.shape
+    w = window
+
+    def padded_cumsum(a):
+        return np.cumsum(np.insert(a, 0, 0.0, axis=0), axis=0)
+
+    cx = padded_cumsum(x)
+    cxx = padded_cumsum(x * x)
+    cy = padded_cumsum(Y)
+    cyy = padded_cumsum(Y * Y)
+    cxy = padded_cumsum(x[:, None] * Y)
+
+    Sx = cx[w:] - cx[:-w]
+    Sxx = cxx[w:] - cxx[:-w]
+    Sy = cy[w:] - cy[:-w]
+    Syy = cyy[w:] - cyy[:-w]
+    Sxy = cxy[w:] - cxy[:-w]
+
+    cov = Sxy - Sx[:, None] * Sy / w
+    # clamp tiny negative variances from cumsum cancellation
+    var_x = np.maximum(Sxx - Sx * Sx / w, 0.0)
+    var_y = np.maximum(Syy - Sy * Sy / w, 0.0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        corr = cov / np.sqrt(var_x[:, None] * var_y)
+        beta = cov / var_y
+
+    out_corr = np.full((n, k), np.nan)
+    out_beta = np.full((n, k), np.nan)
+    out_corr[w - 1:] = corr
+    out_beta[w - 1:] = beta
+    return (pd.DataFrame(out_corr, index=factors.index, columns=factors.columns),
+            pd.DataFrame(out_beta, index=factors.index, columns=factors.columns))
+
+
+def factor_line_chart(df, value_label):
+    """Wide-frame line chart assembled trace-by-trace from the raw arrays.
+    Skips plotly express's per-column frame inspection, and Scattergl renders
+    the ~1000-point series through WebGL instead of SVG paths."""
+    fig = go.Figure()
+    x = df.index
+    for col in df.columns:
+        fig.add_trace(go.Scattergl(x=x, y=df[col].to_numpy(), mode='lines', name=col))
+    fig.update_layout(xaxis_title="Date", yaxis_title=value_label, legend_title="Factor")
+    return fig
+
+
 selected_factors = st.multiselect(
     "Select which factor ETFs to include:",
     options=list(factor_etfs.keys()),
@@ -63,17 +132,16 @@ selected_factors = st.multiselect(
 
 if ticker:
     try:
-        end = datetime.today()
+        # Tomorrow's midnight: day-stable cache key, and yfinance's exclusive
+        # end still includes today's session
+        end = pd.Timestamp.today().normalize() + pd.Timedelta(days=1)
         start = end - timedelta(days=lookback + window)
 
         tickers = [ticker] + list(factor_etfs.keys())
         if compare_ticker:
             tickers.append(compare_ticker)
 
-        data = yf.download(tickers, start=start, end=end, auto_adjust=True)["Close"].dropna(how='all', axis=1)
-
-        if isinstance(data.columns, pd.MultiIndex):
-            data = data.droplevel(0, axis=1)
+        data = load_closes(tuple(sorted(tickers)), start, end)
 
         available_factors = [f for f in factor_etfs if f in data.columns]
         factor_labels = {f: factor_etfs[f] for f in available_factors}
@@ -82,28 +150,22 @@ if ticker:
             st.error("None of the factor ETFs loaded. Please try a different time window.")
         else:
             returns = data.pct_change().dropna()
+            factor_returns = returns[available_factors].rename(columns=factor_labels)
 
             # --- Rolling Correlations ---
             st.subheader("📈 Rolling Correlation to Factors")
             st.caption("This shows how the selected ticker's correlation to each factor ETF changes over time.")
-            rolling_corrs = pd.DataFrame(index=returns.index)
-            for f in available_factors:
-                rolling_corrs[factor_labels[f]] = returns[ticker].rolling(window).corr(returns[f])
+            # Both rolling frames come from one running-sum pass over the
+            # returns panel instead of 2F separate pandas rolling scans.
+            rolling_corrs, beta_df = rolling_corr_beta(returns[ticker], factor_returns, window)
 
-            fig_corr = px.line(rolling_corrs, labels={"value": "Correlation", "index": "Date"})
-            fig_corr.update_layout(legend_title="Factor")
+            fig_corr = factor_line_chart(rolling_corrs, "Correlation")
             st.plotly_chart(fig_corr, use_container_width=True)
 
             # --- Rolling Betas ---
             st.subheader("🧮 Rolling Beta to Factors")
             st.caption("Beta estimates how sensitive the selected ticker is to each factor ETF's return.")
-            beta_df = pd.DataFrame(index=returns.index)
-            for f in available_factors:
-                beta = returns[ticker].rolling(window).cov(returns[f]) / returns[f].rolling(window).var()
-                beta_df[factor_labels[f]] = beta
-
-            fig_beta = px.line(beta_df, labels={"value": "Beta", "index": "Date"})
-            fig_beta.update_layout(legend_title="Factor")
+            fig_beta = factor_line_chart(beta_df, "Beta")
             st.plotly_chart(fig_beta, use_container_width=True)
 
             # --- Radar Chart ---
@@ -119,10 +181,7 @@ if ticker:
             ))
 
             if compare_ticker and compare_ticker in returns.columns:
-                beta_df2 = pd.DataFrame(index=returns.index)
-                for f in available_factors:
-                    beta2 = returns[compare_ticker].rolling(window).cov(returns[f]) / returns[f].rolling(window).var()
-                    beta_df2[factor_labels[f]] = beta2
+                _, beta_df2 = rolling_corr_beta(returns[compare_ticker], factor_returns, window)
 
                 radar.add_trace(go.Scatterpolar(
                     r=beta_df2.mean().values,
@@ -155,47 +214,63 @@ if ticker:
             st.subheader("📉 Rolling Beta Volatility")
             st.caption("Tracks the standard deviation of beta for each factor — more stable beta may indicate more reliable exposure.")
             beta_vol = beta_df.rolling(window).std()
-            fig_vol = px.line(beta_vol, labels={"value": "Beta StdDev", "index": "Date"})
-            fig_vol.update_layout(legend_title="Factor")
+            fig_vol = factor_line_chart(beta_vol, "Beta StdDev")
             st.plotly_chart(fig_vol, use_container_width=True)
 
             # --- Rolling Alpha ---
             st.subheader("📈 Rolling Alpha")
             st.caption("Alpha represents return unexplained by beta exposure — the 'excess' performance.")
-            X_beta = returns[list(factor_labels)].rename(columns=factor_labels)
-            alpha_est = pd.Series(index=returns.index)
-            for t in range(window, len(returns)):
-                y = returns[ticker].iloc[t - window:t]
-                X_win = X_beta.iloc[t - window:t]
-                if len(y) == len(X_win):
-                    model = sm.OLS(y, sm.add_constant(X_win)).fit()
-                    alpha_est.iloc[t] = model.resid.mean()
-
-            fig_alpha = px.line(alpha_est, labels={"value": "Alpha", "index": "Date"})
-            fig_alpha.update_layout(title="Rolling Alpha (Residual Return)", showlegend=False)
+            # Closed-form OLS for every window at once: strided views of the
+            # design matrix, normal equations via two einsums, one batched
+            # LAPACK solve. Replaces ~N statsmodels fits whose per-fit Python
+            # overhead dominated this section.
+            X_np = np.column_stack([np.ones(len(returns)), factor_returns.to_numpy(dtype=np.float64)])
+            y_np = returns[ticker].to_numpy(dtype=np.float64)
+            alpha_est = pd.Series(np.nan, index=returns.index)
+            if len(returns) > window:
+                Xw = sliding_window_view(X_np, window, axis=0).transpose(0, 2, 1)[:-1]
+                yw = sliding_window_view(y_np, window)[:-1]
+                gram = np.einsum('lwp,lwq->lpq', Xw, Xw)
+                moment = np.einsum('lwp,lw->lp', Xw, yw)
+                try:
+                    coefs = np.linalg.solve(gram, moment[..., None])[..., 0]
+                except np.linalg.LinAlgError:
+                    coefs = np.einsum('lpq,lq->lp', np.linalg.pinv(gram), moment)
+                resid = yw - np.einsum('lwp,lp->lw', Xw, coefs)
+                alpha_est.iloc[window:] = resid.mean(axis=1)
+
+            fig_alpha = go.Figure(go.Scattergl(x=alpha_est.index, y=alpha_est.to_numpy(), mode='lines'))
+            fig_alpha.update_layout(title="Rolling Alpha (Residual Return)", showlegend=False,
+                                    xaxis_title="Date", yaxis_title="Alpha")
             st.plotly_chart(fig_alpha, use_container_width=True)
 
             # --- OLS Regression Summary ---
             st.subheader("📘 Multi-Factor Regression")
             st.caption("Fit a linear regression model to estimate how much of the ticker's return is explained by factors.")
-            X = returns[list(factor_labels)].rename(columns=factor_labels)
-            X = sm.add_constant(X)
+            X = sm.add_constant(factor_returns)
             model = sm.OLS(returns[ticker], X, missing='drop').fit()
             st.text(model.summary())
 
             # --- Regression Coefficient Plot ---
             st.subheader("📌 Regression Coefficients")
             st.caption("Estimated impact of each factor on the ticker's return, with confidence intervals.")
+            # One lstsq on the design matrix already built for rolling alpha,
+            # with standard errors from the residuals; skips the statsmodels
+            # results wrapper (influence stats, covariance machinery) that the
+            # bar chart never reads.
+            beta_hat, *_ = np.linalg.lstsq(X_np, y_np, rcond=None)
+            resid_full = y_np - X_np @ beta_hat
+            dof = len(y_np) - X_np.shape[1]
+            sigma2 = resid_full @ resid_full / dof
+            se = np.sqrt(np.diag(sigma2 * np.linalg.inv(X_np.T @ X_np)))
+            half_width = 1.96 * se[1:]
             coef_df = pd.DataFrame({
-                "Factor": model.params.index,
-                "Coefficient": model.params.values,
-                "CI Lower": model.conf_int().iloc[:, 0].values,
-                "CI Upper": model.conf_int().iloc[:, 1].values
+                "Factor": factor_returns.columns,
+                "Coefficient": beta_hat[1:],
+                "CI Half-Width": half_width
             })
-            coef_df = coef_df[coef_df["Factor"] != "const"]
             fig_coef = px.bar(coef_df, x="Factor", y="Coefficient",
-                              error_y=coef_df["CI Upper"] - coef_df["Coefficient"],
-                              error_y_minus=coef_df["Coefficient"] - coef_df["CI Lower"],
+                              error_y=coef_df["CI Half-Width"],
                               color="Coefficient",
                               color_continuous_scale="RdBu",
                               title="Factor Exposure Coefficients")
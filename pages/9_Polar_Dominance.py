@@ -1,7 +1,6 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-import yfinance as yf
 import plotly.graph_objects as go
 from utils.data_utils import fetch_holdings, download_batched
 from inject_font import inject_custom_font, inject_sidebar_logo
@@ -65,20 +64,23 @@ else:
 # Load and process data
 if tickers:
     try:
-        end_date = pd.Timestamp.today()
+        # Tomorrow's midnight: day-stable cache key, and yfinance's exclusive
+        # end still includes today's session
+        end_date = pd.Timestamp.today().normalize() + pd.Timedelta(days=1)
         start_date = end_date - pd.Timedelta(days=lookback_days)
 
-        raw_data, _ = download_batched(tickers, start=start_date, end=end_date)
+        raw_data, _ = download_batched(tickers, start=start_date, end=end_date, auto_adjust=False)
 
-        # Handle both MultiIndex and single-level DataFrames
-        if isinstance(raw_data.columns, pd.MultiIndex):
-            prices = raw_data.xs('Close', level=1, axis=1)
-            opens = raw_data.xs('Open', level=1, axis=1)
-            volumes = raw_data.xs('Volume', level=1, axis=1)
-        else:
-            prices = raw_data['Close'] if 'Close' in raw_data else raw_data
-            opens = raw_data['Open'] if 'Open' in raw_data else yf.download(tickers, start=start_date, end=end_date)["Open"]
-            volumes = raw_data['Volume'] if 'Volume' in raw_data else yf.download(tickers, start=start_date, end=end_date)["Volume"]
+        # Single-ticker downloads come back with flat columns; lift them into
+        # the same (ticker, field) MultiIndex so one xs path serves both
+        # shapes — the old fallback re-downloaded the whole range twice just
+        # to recover Open and Volume.
+        if not isinstance(raw_data.columns, pd.MultiIndex):
+            raw_data = pd.concat({tickers[0]: raw_data}, axis=1)
+
+        prices = raw_data.xs('Close', level=1, axis=1)
+        opens = raw_data.xs('Open', level=1, axis=1)
+        volumes = raw_data.xs('Volume', level=1, axis=1)
 
         valid_tickers = [t for t in tickers if t in prices.columns and t in volumes.columns and t in opens.columns]
 
@@ -86,14 +88,15 @@ if tickers:
         st.subheader("📊 Polar Chart of Volume × Price Movement")
         st.caption("This radar-style chart shows tickers with highest volume-weighted price deltas in a circular layout.")
 
-        dominance_values = {}
-        for t in valid_tickers:
-            delta = (prices[t] - opens[t]).abs() / opens[t]
-            volume_dollar = volumes[t] * prices[t]
-            dominance = (volume_dollar * delta).sum()
-            dominance_values[t] = dominance
+        # Dollar volume x relative intraday move summed per ticker, as one
+        # ufunc chain over the aligned matrices instead of three temporary
+        # Series per ticker in a Python loop.
+        P = prices[valid_tickers].to_numpy(dtype=np.float64)
+        O = opens[valid_tickers].to_numpy(dtype=np.float64)
+        V = volumes[valid_tickers].to_numpy(dtype=np.float64)
+        dominance = np.nansum(V * P * np.abs(P - O) / O, axis=0)
 
-        dom_df = pd.Series(dominance_values).sort_values(ascending=False).head(top_n)
+        dom_df = pd.Series(dominance, index=valid_tickers).nlargest(top_n)
         labels = dom_df.index.tolist()
         values = dom_df.values
 
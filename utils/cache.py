@@ -0,0 +1,118 @@
+import hashlib
+import pickle
+import time
+from functools import wraps
+from pathlib import Path
+
+import pandas as pd
+
+CACHE_DIR = Path(".cache")
+_PRUNE_AFTER = 7 * 86400  # drop entries untouched for a week, whatever their TTL
+
+
+def _canonical(value):
+    """Normalize argument values so equivalent calls share a cache entry;
+    ticker collections hash the same regardless of ordering."""
+    if isinstance(value, (list, tuple, set, frozenset)):
+        items = [_canonical(v) for v in value]
+        if all(isinstance(v, str) for v in value):
+            items = sorted(items)
+        return tuple(items)
+    return value
+
+
+def _cache_key(func_name, args, kwargs):
+    payload = repr((
+        _canonical(args),
+        sorted((k, _canonical(v)) for k, v in kwargs.items()),
+    ))
+    digest = hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+    return f"{func_name}_{digest}"
+
+
+class FileCache:
+    """
+    Disk-backed TTL cache so Streamlit reruns (and restarts) don't re-hit
+    Yahoo for data we already have. DataFrames are stored as parquet,
+    anything else is pickled; a timestamp sidecar tracks expiry.
+    """
+
+    def __init__(self, cache_dir=CACHE_DIR):
+        self.cache_dir = Path(cache_dir)
+
+    def _paths(self, key):
+        base = self.cache_dir / key
+        return base.with_suffix(".parquet"), base.with_suffix(".pkl"), base.with_suffix(".ts")
+
+    def get(self, key, ttl):
+        parquet_path, pickle_path, ts_path = self._paths(key)
+        if not ts_path.exists():
+            return None
+        if time.time() - float(ts_path.read_text()) > ttl:
+            # expired files would otherwise pile up forever in .cache/
+            for path in (parquet_path, pickle_path, ts_path):
+                path.unlink(missing_ok=True)
+            return None
+        if parquet_path.exists():
+            return pd.read_parquet(parquet_path)
+        if pickle_path.exists():
+            with open(pickle_path, "rb") as f:
+                return pickle.load(f)
+        return None
+
+    def _prune(self):
+        """Drop entries untouched for longer than _PRUNE_AFTER. Day-stamped
+        keys are never looked up again once the date boundary rolls over, so
+        get()-side expiry alone would leave one orphan per key per day."""
+        cutoff = time.time() - _PRUNE_AFTER
+        for ts_path in self.cache_dir.glob("*.ts"):
+            try:
+                stale = float(ts_path.read_text()) < cutoff
+            except (OSError, ValueError):
+                stale = True  # unreadable sidecar: drop the entry
+            if stale:
+                base = self.cache_dir / ts_path.stem
+                for path in (base.with_suffix(".parquet"), base.with_suffix(".pkl"), ts_path):
+                    path.unlink(missing_ok=True)
+
+    def set(self, key, value):
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._prune()
+        parquet_path, pickle_path, ts_path = self._paths(key)
+        if isinstance(value, pd.DataFrame):
+            try:
+                value.to_parquet(parquet_path, compression="zstd")
+            except (ImportError, ValueError):
+                value.to_parquet(parquet_path)  # zstd codec unavailable
+        else:
+            with open(pickle_path, "wb") as f:
+                pickle.dump(value, f)
+        ts_path.write_text(str(time.time()))
+
+
+_file_cache = FileCache()
+
+
+def file_cached(ttl=3600):
+    """Memoize a function's return value on disk with a TTL (seconds)."""
+
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            key = _cache_key(func.__name__, args, kwargs)
+            try:
+                cached = _file_cache.get(key, ttl)
+            except Exception:
+                cached = None  # treat any corrupt/unreadable entry as a miss
+            if cached is not None:
+                return cached
+            result = func(*args, **kwargs)
+            try:
+                _file_cache.set(key, result)
+            except Exception:
+                pass
+            return result
+
+        return wrapper
+
+    return decorator
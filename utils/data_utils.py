@@ -1,10 +1,20 @@
+import numpy as np
 import pandas as pd
+import polars as pl
 import yfinance as yf
-from datetime import datetime, timedelta
+from datetime import timedelta
 import streamlit as st
 import time
+from utils.cache import file_cached
 
-@st.cache_data
+try:
+    from numba import njit, prange
+    _HAVE_NUMBA = True
+except ImportError:  # pragma: no cover - numba is in requirements, but JIT is optional
+    _HAVE_NUMBA = False
+
+@st.cache_data(ttl=86400, persist="disk", show_spinner=False)
+@file_cached(ttl=86400)  # holdings change slowly; survive process restarts
 def fetch_holdings(seasonality_ticker):
     import pandas as pd
 
@@ -40,7 +50,7 @@ def fetch_holdings(seasonality_ticker):
 
     return df
 
-@st.cache_data
+@st.cache_data(ttl=3600)
 def fetch_returns(tickers, benchmark, days=365):
     periods = {
         "1D": 1,
@@ -51,7 +61,9 @@ def fetch_returns(tickers, benchmark, days=365):
     }
 
     tickers = list(set(tickers + [benchmark]))
-    end_date = datetime.today()
+    # Tomorrow's midnight: day-stable cache key, and yfinance's exclusive
+    # end still includes today's session
+    end_date = pd.Timestamp.today().normalize() + pd.Timedelta(days=1)
     start_date = end_date - timedelta(days=days)
 
     price_data, _ = download_batched(
@@ -65,15 +77,32 @@ def fetch_returns(tickers, benchmark, days=365):
     else:
         close_prices = price_data
 
-    close_prices = close_prices.dropna(axis=1)
+    # float32 halves memory traffic for the downstream SMA/return reductions;
+    # plenty of precision for display percentages.
+    close_prices = close_prices.dropna(axis=1).astype(np.float32, copy=False)
     latest_date = close_prices.index[-1]
 
-    returns_df = pd.DataFrame(index=close_prices.columns)
+    # Period returns via Polars: each period is one lazy filter + a
+    # first/last reduction evaluated in parallel across ticker columns.
+    # Pandas comes back in at the Streamlit boundary.
+    ticker_cols = close_prices.columns.tolist()
+    lazy_closes = pl.from_pandas(close_prices.reset_index(names="Date")).lazy()
+    period_returns = {}
     for label, delta in periods.items():
         period_start = latest_date - timedelta(days=delta)
-        period_data = close_prices[close_prices.index >= period_start]
-        returns = (period_data.iloc[-1] - period_data.iloc[0]) / period_data.iloc[0] * 100
-        returns_df[label] = returns.round(2)
+        row = (
+            lazy_closes
+            .filter(pl.col("Date") >= period_start)
+            .select([
+                ((pl.col(c).drop_nulls().last() / pl.col(c).drop_nulls().first() - 1) * 100)
+                .round(2).alias(c)
+                for c in ticker_cols
+            ])
+            .collect()
+        )
+        period_returns[label] = row.to_pandas().iloc[0]
+    returns_df = pd.DataFrame(period_returns)
+    returns_df.index = pd.Index(ticker_cols)
 
     returns_df = returns_df.reset_index().rename(columns={"index": "Ticker"})
     etf_row = returns_df[returns_df['Ticker'] == benchmark.upper()]
@@ -81,25 +110,107 @@ def fetch_returns(tickers, benchmark, days=365):
     full_df = pd.concat([etf_row, others], ignore_index=True)
     return full_df, close_prices
 
+SMA_WINDOWS = (20, 50, 200)
+
+if _HAVE_NUMBA:
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _sma_breadth(prices, windows):
+        """Running-sum SMA breadth: for each ticker and window, flag days where
+        price sits above its SMA. One pass per ticker, no rolling intermediates."""
+        n_days, n_tickers = prices.shape
+        above = np.zeros((n_tickers, n_days, windows.shape[0]), dtype=np.float32)
+        for j in prange(n_tickers):
+            for k in range(windows.shape[0]):
+                w = windows[k]
+                running = 0.0
+                for i in range(n_days):
+                    running += prices[i, j]
+                    if i >= w:
+                        running -= prices[i - w, j]
+                    if i >= w - 1 and prices[i, j] > running / w:
+                        above[j, i, k] = 1.0
+        return above
+
+    # Warm the JIT at import on a tiny dummy input so the first real request
+    # doesn't eat LLVM codegen latency; with cache=True subsequent processes
+    # load the compiled kernel straight from disk.
+    _sma_breadth(np.zeros((4, 2), dtype=np.float32), np.asarray([2], dtype=np.int64))
+
+
 def calculate_sma_percentages(price_data, start_date):
     price_data = price_data.loc[price_data.index >= pd.to_datetime(start_date)]
-    results = {"20D": [], "50D": [], "200D": []}
-    for current_date in price_data.index:
-        window = price_data.loc[:current_date]
-        results["20D"].append((window.iloc[-1] > window.rolling(20).mean().iloc[-1]).mean() * 100)
-        results["50D"].append((window.iloc[-1] > window.rolling(50).mean().iloc[-1]).mean() * 100)
-        results["200D"].append((window.iloc[-1] > window.rolling(200).mean().iloc[-1]).mean() * 100)
-    sma_data = pd.DataFrame(results, index=price_data.index)
-    sma_data.columns = ["% > 20D SMA", "% > 50D SMA", "% > 200D SMA"]
+    if _HAVE_NUMBA:
+        prices = np.ascontiguousarray(price_data.to_numpy(dtype=np.float32))
+        windows = np.asarray(SMA_WINDOWS, dtype=np.int64)
+        breadth = _sma_breadth(prices, windows).sum(axis=0) / prices.shape[1] * 100
+        sma_data = pd.DataFrame(breadth, index=price_data.index)
+    else:
+        # One whole-frame rolling mean per window plus a comparison; the old
+        # per-date loop recomputed the rolling mean over the full history
+        # prefix for every single date (O(N^2) in the number of days).
+        sma_data = pd.DataFrame({
+            w: (price_data > price_data.rolling(w).mean()).mean(axis=1) * 100
+            for w in SMA_WINDOWS
+        })
+    sma_data.columns = [f"% > {w}D SMA" for w in SMA_WINDOWS]
     return sma_data
 
 
 import time
+import threading
 import yfinance as yf
 import pandas as pd
 import streamlit as st
+from concurrent.futures import ThreadPoolExecutor
+
+_RATE_LOCK = threading.Lock()
+_MIN_REQUEST_INTERVAL = 0.25  # seconds between Yahoo batch requests, pool-wide
+_next_request_at = 0.0
+
+
+def _throttle():
+    """Space batch requests a fixed interval apart across all worker threads.
+    Replaces the old unconditional 1s cooldown after every download, which
+    stalled each worker even when the pool was nowhere near Yahoo's limits."""
+    global _next_request_at
+    with _RATE_LOCK:
+        now = time.monotonic()
+        wait = _next_request_at - now
+        _next_request_at = max(now, _next_request_at) + _MIN_REQUEST_INTERVAL
+    if wait > 0:
+        time.sleep(wait)
+
+
+def _download_chunk(batch, start, end, period, interval, group_by, auto_adjust,
+                    max_retries, sleep_base):
+    """Download one batch with exponential-backoff retries. Returns a DataFrame
+    (empty on failure) so the caller can attribute failed tickers."""
+    retry_count = 0
+    while retry_count <= max_retries:
+        try:
+            _throttle()
+            data = yf.download(
+                tickers=batch,
+                start=start,
+                end=end,
+                period=period,
+                interval=interval,
+                group_by=group_by,
+                auto_adjust=auto_adjust,
+                progress=False,
+                threads=True
+            )
+            return data
+        except Exception as e:
+            retry_count += 1
+            wait = sleep_base * (2 ** (retry_count - 1))
+            print(f"[Retry {retry_count}] Batch {batch[:3]}... -> {e} | Waiting {wait}s")
+            time.sleep(wait)
+    return pd.DataFrame()
+
 
-@st.cache_data(show_spinner=False)
+@st.cache_data(ttl=3600, show_spinner=False)
+@file_cached(ttl=3600)  # intraday TTL; reruns in a new process hit disk, not Yahoo
 def download_batched(
     tickers,
     start=None,
@@ -113,43 +224,32 @@ def download_batched(
 ):
     """
     Download ticker data in batches of 50 from Yahoo Finance, with retries, backoff, and caching.
+    Batches are fetched concurrently (the downloads are network-bound and release the GIL).
     Returns: combined DataFrame and list of failed tickers.
     """
     all_batches = []
     failed_tickers = []
     tickers = list(set(tickers))  # remove duplicates
 
-    for i in range(0, len(tickers), 50):
-        batch = tickers[i:i + 50]
-        retry_count = 0
-        success = False
-        while not success and retry_count <= max_retries:
-            try:
-                data = yf.download(
-                    tickers=batch,
-                    start=start,
-                    end=end,
-                    period=period,
-                    interval=interval,
-                    group_by=group_by,
-                    auto_adjust=auto_adjust,
-                    progress=False,
-                    threads=True
-                )
-                if not data.empty:
-                    all_batches.append(data)
-                else:
-                    failed_tickers.extend(batch)
-                success = True
-            except Exception as e:
-                retry_count += 1
-                wait = sleep_base * (2 ** (retry_count - 1))
-                print(f"[Retry {retry_count}] Batch {batch[:3]}... -> {e} | Waiting {wait}s")
-                time.sleep(wait)
-        time.sleep(1)  # gentle cooldown
+    batches = [tickers[i:i + 50] for i in range(0, len(tickers), 50)]
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = executor.map(
+            lambda batch: _download_chunk(batch, start, end, period, interval,
+                                          group_by, auto_adjust, max_retries, sleep_base),
+            batches
+        )
+        for batch, data in zip(batches, results):
+            if not data.empty:
+                all_batches.append(data)
+            else:
+                failed_tickers.extend(batch)
 
     if all_batches:
-        combined = pd.concat(all_batches, axis=1)
+        # Single concat of all batch frames, then one final sort_index: with
+        # axis=1, sort governs the row index and sort=False can leave the
+        # union of mismatched batch dates out of chronological order, which
+        # the rolling windows and index slices downstream assume.
+        combined = pd.concat(all_batches, axis=1, sort=False).sort_index()
     else:
         combined = pd.DataFrame()
 
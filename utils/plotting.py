@@ -0,0 +1,33 @@
+import threading
+
+import matplotlib.pyplot as plt
+import streamlit as st
+
+# pyplot's figure registry is process-global and not thread-safe; serialize
+# figure creation across concurrent script threads
+_CREATE_LOCK = threading.Lock()
+
+
+def reusable_figure(name, figsize, nrows=1, sharex=False, height_ratios=None):
+    """Pooled matplotlib (fig, axes) pair, one per chart name and session.
+
+    Streamlit reruns the page script on every widget interaction; recreating
+    Figure/Axes each time churns transient allocations and leans on pyplot's
+    global registry for cleanup. Keeping one Figure alive per chart and
+    clearing its axes with ``cla()`` before redrawing avoids both.
+
+    The pool lives in ``st.session_state`` rather than ``st.cache_resource``:
+    figures are mutable and not thread-safe, so sharing one across sessions
+    would let concurrent users interleave clear/draw/render on the same Axes.
+    Runs within a session are serialized, so per-session figures are safe.
+
+    ``axes`` is a single Axes when nrows == 1, else an array of Axes.
+    """
+    pool = st.session_state.setdefault("_figure_pool", {})
+    key = (name, figsize, nrows, sharex, height_ratios)
+    if key not in pool:
+        gridspec_kw = {'height_ratios': list(height_ratios)} if height_ratios else None
+        with _CREATE_LOCK:
+            pool[key] = plt.subplots(nrows, 1, figsize=figsize, sharex=sharex,
+                                     gridspec_kw=gridspec_kw)
+    return pool[key]
@@ -0,0 +1,83 @@
+"""Per-ticker parquet price store with incremental updates from Yahoo."""
+
+from datetime import timedelta
+from pathlib import Path
+
+import pandas as pd
+import polars as pl
+import yfinance as yf
+
+PRICES_DIR = Path(".cache") / "prices"
+
+
+def _safe_name(ticker):
+    return ticker.replace("^", "_").replace("/", "-")
+
+
+def get_prices(ticker, start, end, auto_adjust=False):
+    """
+    Return OHLCV history for [start, end] served from a local parquet store.
+    Only the gap since the last stored session is fetched from Yahoo; a fresh
+    parquet read is milliseconds vs seconds for the full network round-trip.
+    """
+    start = pd.Timestamp(start)
+    end = pd.Timestamp(end)
+    path = PRICES_DIR / f"{_safe_name(ticker)}.parquet"
+
+    stored = None
+    fetch_start = start
+    if path.exists():
+        lazy = pl.scan_parquet(path)
+        bounds = lazy.select(
+            pl.col("Date").min().alias("lo"),
+            pl.col("Date").max().alias("hi"),
+        ).collect()
+        lo, hi = pd.Timestamp(bounds["lo"][0]), pd.Timestamp(bounds["hi"][0])
+        # always merge the stored history back in, even when the request
+        # starts before it — otherwise the rewrite below would truncate the
+        # store to just the freshly fetched slice
+        stored = lazy.collect()
+        if lo <= start:
+            # store covers the head of the range; only fetch from the last
+            # stored session onward. Starting at hi (not hi + 1) re-fetches
+            # that bar so an intraday price keeps refreshing; the keep="last"
+            # dedupe below prefers the fresh row.
+            fetch_start = hi
+
+    frames = []
+    if stored is not None:
+        frames.append(stored)
+    if fetch_start <= end:
+        # Yahoo's end is exclusive while this function (and the filter below)
+        # treats [start, end] as inclusive; fetch one day past so a cold store
+        # returns the same rows as a warm one.
+        fresh = yf.download(ticker, start=fetch_start, end=end + timedelta(days=1),
+                            auto_adjust=auto_adjust, progress=False)
+        if not fresh.empty:
+            if isinstance(fresh.columns, pd.MultiIndex):
+                fresh.columns = fresh.columns.droplevel(1)
+            frames.append(pl.from_pandas(fresh.reset_index(names="Date")))
+
+    if not frames:
+        # Same shape yfinance returns for an unknown ticker / empty range, so
+        # callers selecting OHLCV columns degrade gracefully instead of
+        # raising KeyError.
+        return pd.DataFrame(
+            columns=["Open", "High", "Low", "Close", "Adj Close", "Volume"],
+            index=pd.DatetimeIndex([], name="Date"),
+        )
+
+    combined = (
+        pl.concat(frames, how="vertical_relaxed")
+        .unique(subset="Date", keep="last")
+        .sort("Date")
+    )
+    PRICES_DIR.mkdir(parents=True, exist_ok=True)
+    combined.write_parquet(path)
+
+    return (
+        combined
+        .filter(pl.col("Date").is_between(start, end))
+        .to_pandas()
+        .set_index("Date")
+    )